@@ -66,3 +66,6 @@ MEASUREMENT_BACKUP_STATUS = "restic_backup_status"
 MEASUREMENT_BACKUP_SUMMARY = "restic_backup_summary"
 MEASUREMENT_REPO_STATS = "restic_repo_stats"
 MEASUREMENT_SNAPSHOTS = "restic_snapshots"
+
+# Maximum number of bytes consumed from piped input in a single read.
+PIPED_READ_SIZE = 1024 * 1024
@@ -71,7 +71,7 @@ class Exporter:
         pass
 
     def export(self, stats: List[Any]) -> None:
-        """Export a statistic."""
+        """Export a batch of statistics."""
         pass
 
     @classmethod
@@ -194,8 +194,11 @@ class ExporterInfluxDB(Exporter):
     def start(self) -> None:
         """Start an exporter."""
         _LOGGER.debug(
-            f"Starting InfluxDB connection to {self._host}:{self._port} "
-            f"for user {self._username} to database {self._database}"
+            "Starting InfluxDB connection to %s:%s for user %s to database %s",
+            self._host,
+            self._port,
+            self._username,
+            self._database,
         )
         self._client = influxdb.InfluxDBClient(
             self._host, self._port, self._username, self._password, self._database
@@ -203,9 +206,9 @@ class ExporterInfluxDB(Exporter):
         self._client.create_database(self._database)
 
     def _submit_points(self, points: List[Dict[str, Any]]) -> None:
-        """Submit an InfluxDB point."""
-        if self._client is not None:
-            _LOGGER.debug(f"Writing data to InfluxDB: {points} ")
+        """Submit a batch of InfluxDB points in a single write."""
+        if self._client is not None and points:
+            _LOGGER.debug("Writing data to InfluxDB: %s", points)
             self._client.write_points(points)
 
     def _add_optional_fields(self, optional_fields: Dict[str, Any]) -> Dict[str, Any]:
@@ -357,7 +360,9 @@ class ExporterInfluxDB(Exporter):
             elif isinstance(stat, ResticRepoStats):
                 points.extend(self._export_repo(stat))
             else:
-                _LOGGER.warning(f"ExporterInfluxDB cannot handle stats of type: {stat}")
+                _LOGGER.warning(
+                    "ExporterInfluxDB cannot handle stats of type: %s", stat
+                )
         self._submit_points(points)
 
 
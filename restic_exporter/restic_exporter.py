@@ -2,13 +2,15 @@
 """Statistics exporter for restic backups."""
 
 import argparse
+import attr
 import datetime
+import io
 import re
 import sys
 import json
 import logging
 import subprocess
-from typing import Any, List, Optional, Union
+from typing import Any, Iterator, List, Optional, Union, cast
 
 from . import get_current_datetime
 
@@ -21,6 +23,7 @@ from .const import (
     KEY_MODE_RAW_DATA,
     KEY_MODE_RESTORE_SIZE,
     KEY_SNAPSHOTS,
+    PIPED_READ_SIZE,
 )
 
 from .exporters import EXPORTERS
@@ -34,7 +37,7 @@ from .types import (
     ResticStats,
     ResticStatsBundle,
     json_to_stats,
-    json_to_snapshot,
+    json_to_snapshots,
     json_to_backup_status,
     json_to_backup_summary,
 )
@@ -49,30 +52,32 @@ class ResticExecutor:
         self, restic_binary: str, restic_args: Optional[List[str]] = None
     ) -> None:
         """Initialize Restic Executor."""
-        self._restic_binary = restic_binary
-        self._restic_args = restic_args or []
+        # Arguments common to every restic invocation, built once.
+        self._command_prefix = [restic_binary, "--json", *(restic_args or [])]
 
     def _run_command(self, args: List[str]) -> Any:
         """Run a Restic command."""
-        args = [self._restic_binary, "--json"] + self._restic_args + args
-        _LOGGER.debug(f"Running: {args}")
+        args = self._command_prefix + args
+        # Logging arguments are formatted lazily, as stdout may be very large.
+        _LOGGER.debug("Running: %s", args)
         out = subprocess.run(args, capture_output=True)
         _LOGGER.debug(
-            f">> Result (rc={out.returncode}): {out.stdout!r}, {out.stderr!r}"
+            ">> Result (rc=%s): %r, %r", out.returncode, out.stdout, out.stderr
         )
         if out.returncode != 0:
             _LOGGER.error(
-                'Command failed ("'
-                + " ".join(args)
-                + f'") with exit code {out.returncode}, '
-                + f"stdout: {out.stdout!r}, stderr: {out.stderr!r}"
+                'Command failed ("%s") with exit code %s, stdout: %r, stderr: %r',
+                " ".join(args),
+                out.returncode,
+                out.stdout,
+                out.stderr,
             )
             return None
 
         try:
             return json.loads(out.stdout)
         except (ValueError, json.decoder.JSONDecodeError):
-            _LOGGER.error(f"{args} yielded non-JSON output: {out.stdout!r}")
+            _LOGGER.error("%s yielded non-JSON output: %r", args, out.stdout)
         return None
 
     def get_stats(
@@ -96,30 +101,20 @@ class ResticExecutor:
         )
         snapshots: List[ResticSnapshot] = []
         for grouped_snapshot in result or []:
-            for json_snapshot in grouped_snapshot.get(KEY_SNAPSHOTS) or []:
-                snapshot = json_to_snapshot(json_snapshot)
-                if snapshot:
-                    snapshots.append(snapshot)
+            snapshots.extend(
+                json_to_snapshots(grouped_snapshot.get(KEY_SNAPSHOTS) or [])
+            )
 
         if not snapshots:
-            _LOGGER.warning(f"No valid snapshots found in JSON: {result}")
+            _LOGGER.warning("No valid snapshots found in JSON: %s", result)
         return snapshots
 
 
-class ResticStatsGenerator:
-    """Generate Restic statistics."""
+class ResticPipedStatsGenerator:
+    """Generate Restic statistics from the output of a running backup."""
 
-    def __init__(
-        self,
-        executor: ResticExecutor,
-        group_by: str,
-        last: bool,
-        backup_status_window_seconds: int,
-    ):
-        """Initialize Restic statistics generator."""
-        self._executor = executor
-        self._group_by = group_by
-        self._last = last
+    def __init__(self, backup_status_window_seconds: int):
+        """Initialize Restic piped statistics generator."""
         self._backup_status_window_seconds: int = backup_status_window_seconds
 
         self._backup_status_last_update: Optional[datetime.datetime] = None
@@ -172,14 +167,30 @@ class ResticStatsGenerator:
             return [self._generate_last_status_from_summary(summary), summary]
         return []
 
+
+class ResticStatsGenerator:
+    """Generate Restic statistics by querying a repository."""
+
+    def __init__(
+        self,
+        executor: ResticExecutor,
+        group_by: str,
+        last: bool,
+    ):
+        """Initialize Restic statistics generator."""
+        self._executor = executor
+        self._group_by = group_by
+        self._last = last
+
     def get_snapshot_stats(self) -> List[ResticSnapshot]:
         """Get Restic snapshots data."""
         snapshots = self._executor.get_snapshots(
             group_by=self._group_by, last=self._last
         )
+        snapshots_with_stats: List[ResticSnapshot] = []
         for snapshot in snapshots:
             assert snapshot.key.snapshot_id
-            snapshot.stats = ResticStatsBundle(
+            snapshot_stats = ResticStatsBundle(
                 raw=self._executor.get_stats(
                     snapshot_ids=[snapshot.key.snapshot_id], mode=KEY_MODE_RAW_DATA
                 ),
@@ -187,7 +198,8 @@ class ResticStatsGenerator:
                     snapshot_ids=[snapshot.key.snapshot_id], mode=KEY_MODE_RESTORE_SIZE
                 ),
             )
-        return snapshots
+            snapshots_with_stats.append(attr.evolve(snapshot, stats=snapshot_stats))
+        return snapshots_with_stats
 
     def get_repo_stats(self) -> List[ResticRepoStats]:
         """Get Restic repository statistics."""
@@ -201,6 +213,23 @@ class ResticStatsGenerator:
         ]
 
 
+def read_piped_lines(stream: io.BufferedIOBase) -> Iterator[List[str]]:
+    """Read batches of all complete lines currently available from a stream."""
+    remainder = b""
+    while True:
+        # read1() returns whatever is already available (up to the limit) rather
+        # than blocking for the full amount.
+        data = stream.read1(PIPED_READ_SIZE)
+        if not data:
+            break
+        lines = (remainder + data).split(b"\n")
+        remainder = lines.pop()
+        if lines:
+            yield [line.decode(errors="replace") for line in lines]
+    if remainder:
+        yield [remainder.decode(errors="replace")]
+
+
 def split_arg(arg: str) -> Optional[List[str]]:
     """Split an argument into multiple."""
     if not arg:
@@ -269,7 +298,7 @@ def main() -> None:
         action="store_true",
     )
     ap.add_argument(
-        "exporters", nargs="+", help="Exporters to output to.", choices=EXPORTERS.keys()
+        "exporters", nargs="+", help="Exporters to output to.", choices=tuple(EXPORTERS)
     )
     ap.add_argument("--backup-host", help="Host to attach to stats piped from backup.")
     ap.add_argument(
@@ -287,8 +316,8 @@ def main() -> None:
         help="1 status update is allowed per window, set to 0 for no limit.",
     )
 
-    for exporter_key in EXPORTERS:
-        EXPORTERS[exporter_key].add_args_to_parser(ap)
+    for exporter_class in EXPORTERS.values():
+        exporter_class.add_args_to_parser(ap)
 
     args = ap.parse_args()
 
@@ -305,29 +334,39 @@ def main() -> None:
             exporter.start()
             exporters.append(exporter)
 
-    generator = ResticStatsGenerator(
-        executor=ResticExecutor(
-            restic_binary=args.restic_binary, restic_args=split_arg(args.restic_args)
-        ),
-        group_by=args.group_by,
-        last=not args.all,
-        backup_status_window_seconds=args.backup_status_window_seconds,
-    )
-
     stats: List[
         Union[ResticBackupStatus, ResticBackupSummary, ResticRepoStats, ResticSnapshot]
     ] = []
 
     if not sys.stdin.isatty():
         key = get_snapshot_key_from_args(ap, args)
-        while True:
-            line = sys.stdin.readline()
-            if not line:
-                break
-            stats.extend(generator.get_piped_stats(line, key))
+        piped_generator = ResticPipedStatsGenerator(
+            backup_status_window_seconds=args.backup_status_window_seconds
+        )
+        for lines in read_piped_lines(cast(io.BufferedIOBase, sys.stdin.buffer)):
+            # Keep draining stdin so the piping restic process is never blocked.
+            if not exporters:
+                continue
+            # Export the stats from all lines available so far as a single batch.
+            stats = [
+                stat
+                for line in lines
+                for stat in piped_generator.get_piped_stats(line, key)
+            ]
+            if not stats:
+                continue
             for exporter in exporters:
                 exporter.export(stats)
-    else:
+    elif exporters:
+        # The executor is only needed (and so only built) when querying restic.
+        generator = ResticStatsGenerator(
+            executor=ResticExecutor(
+                restic_binary=args.restic_binary,
+                restic_args=split_arg(args.restic_args),
+            ),
+            group_by=args.group_by,
+            last=not args.all,
+        )
         stats.extend(generator.get_snapshot_stats())
         stats.extend(generator.get_repo_stats())
         for exporter in exporters:
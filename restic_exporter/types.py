@@ -1,9 +1,12 @@
 """Types used in Restic Exporter."""
 import attr
-from dateutil import parser as dateutil_parser
 import datetime
+import functools
 import logging
-from typing import Any, Dict, List, Optional, Union
+import operator
+import re
+import sys
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 
 from .const import (
     KEY_SNAPSHOT_HOSTNAME,
@@ -40,31 +43,75 @@ from .const import (
 _LOGGER = logging.getLogger(__name__)
 
 
-def convert_int_or_none(val: Optional[int]) -> Optional[int]:
-    """Convert to an int or None."""
-    return int(val) if val is not None else val
+# RFC 3339 timestamps as output by restic, e.g. 2020-12-28T21:28:23.403981118-08:00
+_RE_RFC3339 = re.compile(
+    r"(\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2})(?:\.(\d+))?(Z|[+-]\d{2}:\d{2})?$"
+)
+
+
+@functools.lru_cache(maxsize=None)
+def _get_timezone(offset: str) -> datetime.timezone:
+    """Get a timezone for an RFC 3339 offset, shared between all timestamps."""
+    if offset == "Z":
+        return datetime.timezone.utc
+    delta = datetime.timedelta(hours=int(offset[1:3]), minutes=int(offset[4:6]))
+    return datetime.timezone(-delta if offset[0] == "-" else delta)
+
+
+def parse_time(val: str) -> datetime.datetime:
+    """Parse an RFC 3339 timestamp as output by restic."""
+    match = _RE_RFC3339.match(val)
+    if not match:
+        raise ValueError(f"Not an RFC 3339 timestamp: {val}")
+    base, fraction, offset = match.groups()
+    # datetime.fromisoformat() only supports microsecond precision and, prior
+    # to Python 3.11, no fractions other than 3 or 6 digits.
+    parsed = datetime.datetime.fromisoformat(
+        base + "." + (fraction or "")[:6].ljust(6, "0")
+    )
+    if offset is None:
+        return parsed
+    return parsed.replace(tzinfo=_get_timezone(offset))
+
+
+# Converters validate as they convert, so each field costs a single call.
+def convert_positive_int(val: Any) -> int:
+    """Convert to a positive int."""
+    out = int(val)
+    if out < 0:
+        raise ValueError(f"Expected positive number: {out}")
+    return out
 
 
-def convert_float_or_none(val: Optional[float]) -> Optional[float]:
-    """Convert to a float or None."""
-    return float(val) if val is not None else val
+def convert_positive_float(val: Any) -> float:
+    """Convert to a positive float."""
+    out = float(val)
+    if out < 0:
+        raise ValueError(f"Expected positive number: {out}")
+    return out
 
 
-def convert_str_or_none(val: Optional[str]) -> Optional[str]:
-    """Convert to a str or None."""
-    return str(val) if val is not None else val
+def convert_percent(val: Any) -> float:
+    """Convert to a float % between 0-1."""
+    out = float(val)
+    if out < 0 or out > 1:
+        raise ValueError(f"Not a valid percent: {out}")
+    return out
 
 
-def validate_percent(_: Any, __: Any, val: Optional[float]) -> None:
-    """Validate a float % between 0-1."""
-    if val is not None and (val < 0 or val > 1):
-        raise ValueError(f"Not a valid percent: {val}")
+def convert_non_empty_str(val: Any) -> str:
+    """Convert to a non-empty string."""
+    out = str(val)
+    if out == "":
+        raise ValueError(f"Expected non-empty string: {out}")
+    return out
 
 
-def validate_positive(_: Any, __: Any, val: Optional[Union[float, int]]) -> None:
-    """Validate a positive float/int."""
-    if val is not None and (val < 0):
-        raise ValueError(f"Expected positive number: {val}")
+def convert_str_tuple(val: Iterable[str]) -> Tuple[str, ...]:
+    """Convert a list (or tuple) of strings to a tuple."""
+    if not isinstance(val, (list, tuple)):
+        raise TypeError(f"Expected a list of strings: {val!r}")
+    return tuple(val)
 
 
 def validate_non_empty_str(_: Any, __: Any, val: Optional[str]) -> None:
@@ -74,14 +121,38 @@ def validate_non_empty_str(_: Any, __: Any, val: Optional[str]) -> None:
         raise ValueError(f"Expected non-empty string: {val}")
 
 
-@attr.s
+# Validators shared between attributes, built once at import.
+_VALIDATE_DATETIME = attr.validators.instance_of(datetime.datetime)
+_VALIDATE_NON_EMPTY_STR = attr.validators.and_(
+    attr.validators.instance_of(str), validate_non_empty_str
+)
+
+
+@attr.s(slots=True, frozen=True, weakref_slot=False)
 class ResticStats:
     """Basic Restic statistics."""
 
-    total_size: int = attr.ib(converter=int, validator=[validate_positive])
-    total_file_count: int = attr.ib(converter=int, validator=[validate_positive])
+    total_size: int = attr.ib(converter=convert_positive_int)
+    total_file_count: int = attr.ib(converter=convert_positive_int)
     total_blob_count: Optional[int] = attr.ib(
-        default=None, converter=convert_int_or_none, validator=[validate_positive]
+        default=None, converter=attr.converters.optional(convert_positive_int)
+    )
+
+
+_VALIDATE_OPTIONAL_STATS = attr.validators.instance_of((type(None), ResticStats))
+
+
+# Snapshots of unchanged data report identical stats, and ResticStats is
+# immutable, so equal values can share a single instance.
+@functools.lru_cache(maxsize=256)
+def _build_stats(
+    total_size: Any, total_file_count: Any, total_blob_count: Any
+) -> ResticStats:
+    """Build (or reuse) a ResticStats object for the given values."""
+    return ResticStats(
+        total_size=total_size,
+        total_file_count=total_file_count,
+        total_blob_count=total_blob_count,
     )
 
 
@@ -90,68 +161,79 @@ def json_to_stats(stats_json: Optional[Dict[str, Any]]) -> Optional[ResticStats]
     if not stats_json:
         return None
 
-    blob_count = stats_json.get(KEY_STATS_TOTAL_BLOB_COUNT)
     try:
-        return ResticStats(
-            total_size=stats_json[KEY_STATS_TOTAL_SIZE],
-            total_file_count=stats_json[KEY_STATS_TOTAL_FILE_COUNT],
-            total_blob_count=blob_count,
+        return _build_stats(
+            stats_json[KEY_STATS_TOTAL_SIZE],
+            stats_json[KEY_STATS_TOTAL_FILE_COUNT],
+            stats_json.get(KEY_STATS_TOTAL_BLOB_COUNT),
         )
     except KeyError as ex:
-        _LOGGER.warning(f"Skipping restic stats with missing key: {ex}")
+        _LOGGER.warning("Skipping restic stats with missing key: %s", ex)
     except ValueError as ex:
-        _LOGGER.warning(f"Skipping restic stats with invalid value: {ex}")
+        _LOGGER.warning("Skipping restic stats with invalid value: %s", ex)
     return None
 
 
-@attr.s
+@attr.s(slots=True, frozen=True, weakref_slot=False)
 class ResticStatsBundle:
     """A bundle of Restic stats."""
 
     raw: Optional[ResticStats] = attr.ib(
-        validator=attr.validators.instance_of((type(None), ResticStats)),
+        validator=_VALIDATE_OPTIONAL_STATS,
         default=None,
     )
     restore: Optional[ResticStats] = attr.ib(
-        validator=attr.validators.instance_of((type(None), ResticStats)),
+        validator=_VALIDATE_OPTIONAL_STATS,
         default=None,
     )
 
 
-@attr.s
+_VALIDATE_STATS_BUNDLE = attr.validators.instance_of(ResticStatsBundle)
+_VALIDATE_OPTIONAL_STATS_BUNDLE = attr.validators.instance_of(
+    (type(None), ResticStatsBundle)
+)
+
+
+@attr.s(slots=True, frozen=True, weakref_slot=False)
 class ResticSnapshotKeys:
     """A key representing a Restic snapshot."""
 
-    hostname: str = attr.ib(
-        validator=[attr.validators.instance_of(str), validate_non_empty_str]
-    )
-    paths: List[str] = attr.ib(
-        factory=list, validator=attr.validators.instance_of(list)
-    )
-    tags: Optional[List[str]] = attr.ib(
-        factory=list, validator=attr.validators.instance_of((type(None), list))
+    hostname: str = attr.ib(validator=_VALIDATE_NON_EMPTY_STR)
+    paths: Tuple[str, ...] = attr.ib(factory=tuple, converter=convert_str_tuple)
+    tags: Optional[Tuple[str, ...]] = attr.ib(
+        factory=tuple, converter=attr.converters.optional(convert_str_tuple)
     )
     snapshot_id: Optional[str] = attr.ib(
-        default=None, converter=convert_str_or_none, validator=[validate_non_empty_str]
+        default=None, converter=attr.converters.optional(convert_non_empty_str)
     )
 
 
-@attr.s
+_VALIDATE_SNAPSHOT_KEYS = attr.validators.instance_of(ResticSnapshotKeys)
+
+
+@attr.s(slots=True, frozen=True, weakref_slot=False)
 class ResticSnapshot:
     """A Restic snapshot."""
 
-    key: ResticSnapshotKeys = attr.ib(
-        validator=attr.validators.instance_of(ResticSnapshotKeys)
-    )
-    snapshot_time: datetime.datetime = attr.ib(
-        validator=[attr.validators.instance_of(datetime.datetime)]
-    )
+    key: ResticSnapshotKeys = attr.ib(validator=_VALIDATE_SNAPSHOT_KEYS)
+    snapshot_time: datetime.datetime = attr.ib(validator=_VALIDATE_DATETIME)
     stats: Optional[ResticStatsBundle] = attr.ib(
         default=None,
-        validator=attr.validators.instance_of((type(None), ResticStatsBundle)),
+        validator=_VALIDATE_OPTIONAL_STATS_BUNDLE,
     )
 
 
+def _intern(val: Any) -> Any:
+    """Intern a string (or a list of strings, as a tuple), leaving others untouched."""
+    if isinstance(val, str):
+        return sys.intern(val)
+    if isinstance(val, list):
+        return tuple(
+            sys.intern(item) if isinstance(item, str) else item for item in val
+        )
+    return val
+
+
 def json_to_snapshot(snapshot_json: Dict[str, Any]) -> Optional[ResticSnapshot]:
     """Convert 'restic snapshots' JSON to a ResticStats object."""
     if not snapshot_json:
@@ -159,93 +241,120 @@ def json_to_snapshot(snapshot_json: Dict[str, Any]) -> Optional[ResticSnapshot]:
     try:
         snapshot_time = snapshot_json[KEY_SNAPSHOT_TIME]
         try:
-            snapshot_time = dateutil_parser.parse(snapshot_time)
-        except (TypeError, dateutil_parser.ParserError):  # type: ignore
-            _LOGGER.warning(f"Skipping unparsable snapshot time: {snapshot_time}")
+            snapshot_time = parse_time(snapshot_time)
+        except (TypeError, ValueError):
+            _LOGGER.warning("Skipping unparsable snapshot time: %s", snapshot_time)
             return None
+        # Hostnames, paths and tags repeat across snapshots, so share a single
+        # copy of each string.
         return ResticSnapshot(
             key=ResticSnapshotKeys(
-                hostname=snapshot_json[KEY_SNAPSHOT_HOSTNAME],
-                paths=snapshot_json[KEY_SNAPSHOT_PATHS],
-                tags=snapshot_json.get(KEY_SNAPSHOT_TAGS),
+                hostname=_intern(snapshot_json[KEY_SNAPSHOT_HOSTNAME]),
+                paths=_intern(snapshot_json[KEY_SNAPSHOT_PATHS]),
+                tags=_intern(snapshot_json.get(KEY_SNAPSHOT_TAGS)),
                 snapshot_id=snapshot_json[KEY_SNAPSHOT_SHORT_ID],
             ),
             snapshot_time=snapshot_time,
         )
     except KeyError as ex:
-        _LOGGER.warning(f"Skipping snapshot with missing key: {ex}")
+        _LOGGER.warning("Skipping snapshot with missing key: %s", ex)
     return None
 
 
-@attr.s
+def json_to_snapshots(snapshots_json: Iterable[Dict[str, Any]]) -> List[ResticSnapshot]:
+    """Convert 'restic snapshots' JSON to ResticSnapshot objects, skipping invalid."""
+    return [snapshot for snapshot in map(json_to_snapshot, snapshots_json) if snapshot]
+
+
+@attr.s(slots=True, frozen=True, weakref_slot=False)
 class ResticBackupStatus:
     """Status of a Restic backup in progress."""
 
-    key: ResticSnapshotKeys = attr.ib(
-        validator=attr.validators.instance_of(ResticSnapshotKeys)
-    )
-    files_total: int = attr.ib(converter=int, validator=[validate_positive])
-    bytes_total: int = attr.ib(converter=int, validator=[validate_positive])
+    key: ResticSnapshotKeys = attr.ib(validator=_VALIDATE_SNAPSHOT_KEYS)
+    files_total: int = attr.ib(converter=convert_positive_int)
+    bytes_total: int = attr.ib(converter=convert_positive_int)
     percent_done: Optional[float] = attr.ib(
-        default=None, converter=convert_float_or_none, validator=[validate_percent]
+        default=None, converter=attr.converters.optional(convert_percent)
     )
     files_done: Optional[int] = attr.ib(
-        default=None, converter=convert_int_or_none, validator=[validate_positive]
+        default=None, converter=attr.converters.optional(convert_positive_int)
     )
     bytes_done: Optional[int] = attr.ib(
-        default=None, converter=convert_int_or_none, validator=[validate_positive]
+        default=None, converter=attr.converters.optional(convert_positive_int)
     )
     seconds_elapsed: Optional[int] = attr.ib(
-        default=None, converter=convert_int_or_none, validator=[validate_positive]
+        default=None, converter=attr.converters.optional(convert_positive_int)
     )
     seconds_remaining: Optional[int] = attr.ib(
-        default=None, converter=convert_int_or_none, validator=[validate_positive]
+        default=None, converter=attr.converters.optional(convert_positive_int)
     )
 
 
+_get_status_required_fields = operator.itemgetter(
+    KEY_STATUS_FILES_TOTAL, KEY_STATUS_BYTES_TOTAL
+)
+
+
 def json_to_backup_status(
     status_json: Dict[str, Any], key: ResticSnapshotKeys
 ) -> Optional[ResticBackupStatus]:
     """Convert Restic backup status JSON messages to a ResticBackupStatus object."""
     if not status_json:
         return None
+    get = status_json.get
     try:
+        files_total, bytes_total = _get_status_required_fields(status_json)
         return ResticBackupStatus(
             key=key,
-            files_total=status_json[KEY_STATUS_FILES_TOTAL],
-            bytes_total=status_json[KEY_STATUS_BYTES_TOTAL],
-            percent_done=status_json.get(KEY_STATUS_PERCENT_DONE),
-            files_done=status_json.get(KEY_STATUS_FILES_DONE),
-            bytes_done=status_json.get(KEY_STATUS_BYTES_DONE),
-            seconds_elapsed=status_json.get(KEY_STATUS_SECONDS_ELAPSED),
-            seconds_remaining=status_json.get(KEY_STATUS_SECONDS_REMAINING),
+            files_total=files_total,
+            bytes_total=bytes_total,
+            percent_done=get(KEY_STATUS_PERCENT_DONE),
+            files_done=get(KEY_STATUS_FILES_DONE),
+            bytes_done=get(KEY_STATUS_BYTES_DONE),
+            seconds_elapsed=get(KEY_STATUS_SECONDS_ELAPSED),
+            seconds_remaining=get(KEY_STATUS_SECONDS_REMAINING),
         )
     except KeyError as ex:
-        _LOGGER.warning(f"Skipping backup status with missing key: {ex}")
+        _LOGGER.warning("Skipping backup status with missing key: %s", ex)
     except ValueError as ex:
-        _LOGGER.warning(f"Skipping backup status with invalid value: {ex}")
+        _LOGGER.warning("Skipping backup status with invalid value: %s", ex)
     return None
 
 
-@attr.s
+@attr.s(slots=True, frozen=True, weakref_slot=False)
 class ResticBackupSummary:
     """Summary of a Restic backup completed."""
 
-    key: ResticSnapshotKeys = attr.ib(
-        validator=attr.validators.instance_of(ResticSnapshotKeys)
-    )
-    files_new: int = attr.ib(converter=int, validator=[validate_positive])
-    files_changed: int = attr.ib(converter=int, validator=[validate_positive])
-    files_unmodified: int = attr.ib(converter=int, validator=[validate_positive])
-    dirs_new: int = attr.ib(converter=int, validator=[validate_positive])
-    dirs_changed: int = attr.ib(converter=int, validator=[validate_positive])
-    dirs_unmodified: int = attr.ib(converter=int, validator=[validate_positive])
-    data_added: int = attr.ib(converter=int, validator=[validate_positive])
-    files_processed: int = attr.ib(converter=int, validator=[validate_positive])
-    bytes_processed: int = attr.ib(converter=int, validator=[validate_positive])
-    data_blobs: int = attr.ib(converter=int, validator=[validate_positive])
-    tree_blobs: int = attr.ib(converter=int, validator=[validate_positive])
-    duration: float = attr.ib(converter=float, validator=[validate_positive])
+    key: ResticSnapshotKeys = attr.ib(validator=_VALIDATE_SNAPSHOT_KEYS)
+    files_new: int = attr.ib(converter=convert_positive_int)
+    files_changed: int = attr.ib(converter=convert_positive_int)
+    files_unmodified: int = attr.ib(converter=convert_positive_int)
+    dirs_new: int = attr.ib(converter=convert_positive_int)
+    dirs_changed: int = attr.ib(converter=convert_positive_int)
+    dirs_unmodified: int = attr.ib(converter=convert_positive_int)
+    data_added: int = attr.ib(converter=convert_positive_int)
+    files_processed: int = attr.ib(converter=convert_positive_int)
+    bytes_processed: int = attr.ib(converter=convert_positive_int)
+    data_blobs: int = attr.ib(converter=convert_positive_int)
+    tree_blobs: int = attr.ib(converter=convert_positive_int)
+    duration: float = attr.ib(converter=convert_positive_float)
+
+
+# Extracts the summary fields in the order of the ResticBackupSummary attributes.
+_get_summary_fields = operator.itemgetter(
+    KEY_SUMMARY_FILES_NEW,
+    KEY_SUMMARY_FILES_CHANGED,
+    KEY_SUMMARY_FILES_UNMODIFIED,
+    KEY_SUMMARY_DIRS_NEW,
+    KEY_SUMMARY_DIRS_CHANGED,
+    KEY_SUMMARY_DIRS_UNMODIFIED,
+    KEY_SUMMARY_DATA_ADDED,
+    KEY_SUMMARY_TOTAL_FILES_PROCESSED,
+    KEY_SUMMARY_TOTAL_BYTES_PROCESSED,
+    KEY_SUMMARY_DATA_BLOBS,
+    KEY_SUMMARY_TREE_BLOBS,
+    KEY_SUMMARY_TOTAL_DURATION,
+)
 
 
 def json_to_backup_summary(
@@ -255,33 +364,21 @@ def json_to_backup_summary(
     if not summary_json:
         return None
     try:
-        key.snapshot_id = summary_json[KEY_SUMMARY_SNAPSHOT_ID]
         return ResticBackupSummary(
-            key=key,
-            files_new=summary_json[KEY_SUMMARY_FILES_NEW],
-            files_changed=summary_json[KEY_SUMMARY_FILES_CHANGED],
-            files_unmodified=summary_json[KEY_SUMMARY_FILES_UNMODIFIED],
-            dirs_new=summary_json[KEY_SUMMARY_DIRS_NEW],
-            dirs_changed=summary_json[KEY_SUMMARY_DIRS_CHANGED],
-            dirs_unmodified=summary_json[KEY_SUMMARY_DIRS_UNMODIFIED],
-            data_added=summary_json[KEY_SUMMARY_DATA_ADDED],
-            files_processed=summary_json[KEY_SUMMARY_TOTAL_FILES_PROCESSED],
-            bytes_processed=summary_json[KEY_SUMMARY_TOTAL_BYTES_PROCESSED],
-            data_blobs=summary_json[KEY_SUMMARY_DATA_BLOBS],
-            tree_blobs=summary_json[KEY_SUMMARY_TREE_BLOBS],
-            duration=summary_json[KEY_SUMMARY_TOTAL_DURATION],
+            attr.evolve(key, snapshot_id=summary_json[KEY_SUMMARY_SNAPSHOT_ID]),
+            *_get_summary_fields(summary_json),
         )
     except KeyError as ex:
-        _LOGGER.warning(f"Skipping backup summary with missing key: {ex}")
+        _LOGGER.warning("Skipping backup summary with missing key: %s", ex)
     except ValueError as ex:
-        _LOGGER.warning(f"Skipping backup summary with invalid value: {ex}")
+        _LOGGER.warning("Skipping backup summary with invalid value: %s", ex)
     return None
 
 
-@attr.s
+@attr.s(slots=True, frozen=True, weakref_slot=False)
 class ResticRepoStats:
     """Restic repository statistics."""
 
     stats: ResticStatsBundle = attr.ib(
-        validator=attr.validators.instance_of(ResticStatsBundle),
+        validator=_VALIDATE_STATS_BUNDLE,
     )
@@ -15,7 +15,7 @@ setuptools.setup(
         "console_scripts": ["restic-exporter=restic_exporter.restic_exporter:main"],
     },
     include_package_data=True,
-    install_requires=["attrs", "dateparser", "influxdb"],
+    install_requires=["attrs", "influxdb"],
     long_description=long_description,
     long_description_content_type="text/markdown",
     keywords="restic backup statistics",
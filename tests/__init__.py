@@ -1,7 +1,16 @@
 """Testing for Restic Exporter."""
 
+import datetime
 from typing import Any, Dict
 
+from restic_exporter.types import ResticSnapshotKeys
+
+TEST_UTC_MINUS_8 = datetime.timezone(datetime.timedelta(hours=-8))
+TEST_FROZEN_NOW = datetime.datetime(2020, 12, 30, 8, 27, 23)
+
+# Restic types are immutable, so test values can be shared between tests.
+TEST_SNAPSHOT_KEY = ResticSnapshotKeys(hostname="hostname", paths=["path1"])
+
 TEST_STATS_DATA_RAW = {"total_size": 1709, "total_file_count": 1, "total_blob_count": 4}
 TEST_STATS_DATA_RESTORE = {
     "total_size": 1710,
@@ -1,12 +1,14 @@
 """Tests for the Restic Rxporter exporters."""
 import argparse
 import datetime
-import dateutil
-import logging
-import os
-from typing import Any, Tuple
+import pathlib
+from typing import Any, Iterator, Tuple
 from unittest import mock
 
+import influxdb  # type: ignore
+import pytest  # type: ignore
+
+from restic_exporter import exporters
 from restic_exporter.const import EXPORTER_INFLUXDB
 from restic_exporter.exporters import Exporter, EXPORTERS
 
@@ -20,9 +22,13 @@ from restic_exporter.types import (
     ResticStatsBundle,
 )
 
-logging.basicConfig()
-_LOGGER = logging.getLogger(__name__)
-_LOGGER.setLevel(logging.DEBUG)
+from . import TEST_FROZEN_NOW, TEST_SNAPSHOT_KEY, TEST_UTC_MINUS_8
+
+# Without blob counts, so that no blob fields are exported.
+_STATS_BUNDLE_NO_BLOBS = ResticStatsBundle(
+    raw=ResticStats(total_size=1709, total_file_count=1, total_blob_count=None),
+    restore=ResticStats(total_size=1710, total_file_count=2, total_blob_count=None),
+)
 
 
 def test_exporter_add_args_to_parser() -> None:
@@ -51,28 +57,42 @@ def test_exporter_export() -> None:
     exporter.export([])
 
 
-def test_exporter_get_password(tmp_path: str) -> None:
+def test_exporter_get_password(tmp_path: pathlib.Path, monkeypatch: Any) -> None:
     """Test Exporter.get_password()."""
     password_env = "TEST_ENV_VAR"
-    os.environ[password_env] = "test_password"
+    monkeypatch.setenv(password_env, "test_password")
 
     assert Exporter.get_password(password_env) == "test_password"
 
-    password_file_path = os.path.join(tmp_path, "restic_exporter_password_file")
-    with open(password_file_path, "w") as fh:
-        fh.write("different_test_password")
+    password_file_path = tmp_path / "restic_exporter_password_file"
+    password_file_path.write_text("different_test_password")
     assert (
-        Exporter.get_password(password_env, password_file_path)
+        Exporter.get_password(password_env, str(password_file_path))
         == "different_test_password"
     )
 
 
-def test_exporter_influxdb_add_args_to_parser() -> None:
-    """Test ExporterInfluxDB.add_args_to_parser()."""
-    exporter_class = EXPORTERS[EXPORTER_INFLUXDB]
+@pytest.fixture(scope="session")  # type: ignore
+def influxdb_arg_parser() -> argparse.ArgumentParser:
+    """Provide a parser with the InfluxDB exporter arguments registered."""
     ap = argparse.ArgumentParser()
-    exporter_class.add_args_to_parser(ap)
-    args = ap.parse_args("")
+    EXPORTERS[EXPORTER_INFLUXDB].add_args_to_parser(ap)
+    return ap
+
+
+@pytest.fixture(scope="session")  # type: ignore
+def influxdb_default_args(
+    influxdb_arg_parser: argparse.ArgumentParser,
+) -> argparse.Namespace:
+    """Provide the default InfluxDB exporter arguments."""
+    return influxdb_arg_parser.parse_args("")
+
+
+def test_exporter_influxdb_add_args_to_parser(
+    influxdb_default_args: argparse.Namespace,
+) -> None:
+    """Test ExporterInfluxDB.add_args_to_parser()."""
+    args = influxdb_default_args
     assert args.influxdb_database == "restic"
     assert args.influxdb_host == "localhost"
     assert args.influxdb_username is None
@@ -80,13 +100,11 @@ def test_exporter_influxdb_add_args_to_parser() -> None:
     assert args.influxdb_port == 8086
 
 
-def test_exporter_influxdb_construct_from_args() -> None:
+def test_exporter_influxdb_construct_from_args(
+    influxdb_default_args: argparse.Namespace,
+) -> None:
     """Test ExporterInfluxDB.construct_from_args()."""
-    exporter_class = EXPORTERS[EXPORTER_INFLUXDB]
-    ap = argparse.ArgumentParser()
-    exporter_class.add_args_to_parser(ap)
-    args = ap.parse_args("")
-    exporter = exporter_class.construct_from_args(args)
+    exporter = EXPORTERS[EXPORTER_INFLUXDB].construct_from_args(influxdb_default_args)
     assert exporter._database == "restic"
     assert exporter._host == "localhost"
     assert exporter._username is None
@@ -97,7 +115,7 @@ def test_exporter_influxdb_construct_from_args() -> None:
 def setup_test_influxdb_exporter(
     mock_influxdb: mock.Mock,
 ) -> Tuple[Exporter, mock.Mock]:
-    """Create a test InfluxDB exporter."""
+    """Create and start a test InfluxDB exporter."""
     exporter = EXPORTERS[EXPORTER_INFLUXDB](
         host="test_host",
         port=1234,
@@ -105,38 +123,47 @@ def setup_test_influxdb_exporter(
         password="test_password",
         database="test_database",
     )
-    assert exporter is not None
 
     mock_influxdb_client = mock.Mock()
     mock_influxdb.return_value = mock_influxdb_client
 
     exporter.start()
+    return (exporter, mock_influxdb_client)
 
-    mock_influxdb.assert_called_with(
-        "test_host", 1234, "test_username", "test_password", "test_database"
-    )
-    assert mock_influxdb_client.create_database.called
 
-    return (exporter, mock_influxdb_client)
+@pytest.fixture  # type: ignore
+def influxdb_exporter() -> Iterator[Tuple[Exporter, mock.Mock]]:
+    """Provide a started InfluxDB exporter and its mock client."""
+    with mock.patch.object(influxdb, "InfluxDBClient") as mock_influxdb:
+        yield setup_test_influxdb_exporter(mock_influxdb)
+
+
+@pytest.fixture  # type: ignore
+def frozen_datetime(monkeypatch: Any) -> datetime.datetime:
+    """Freeze the exporter's notion of the current time."""
+    monkeypatch.setattr(exporters, "get_current_datetime", lambda: TEST_FROZEN_NOW)
+    return TEST_FROZEN_NOW
 
 
-@mock.patch("restic_exporter.exporters.influxdb.InfluxDBClient")
-def test_exporter_influxdb_start(mock_influxdb: mock.Mock) -> None:
+def test_exporter_influxdb_start() -> None:
     """Test ExporterInfluxDB.start()."""
-    (_, _) = setup_test_influxdb_exporter(mock_influxdb)
+    with mock.patch.object(influxdb, "InfluxDBClient") as mock_influxdb:
+        (_, mock_influxdb_client) = setup_test_influxdb_exporter(mock_influxdb)
+
+    mock_influxdb.assert_called_with(
+        "test_host", 1234, "test_username", "test_password", "test_database"
+    )
+    assert mock_influxdb_client.create_database.called
 
 
-@mock.patch("restic_exporter.exporters.influxdb.InfluxDBClient")
-@mock.patch("restic_exporter.exporters.get_current_datetime")
 def test_exporter_influxdb_export_restic_backup_status(
-    mock_current_datetime: mock.Mock, mock_influxdb: mock.Mock
+    influxdb_exporter: Tuple[Exporter, mock.Mock], frozen_datetime: datetime.datetime
 ) -> None:
     """Test ExporterInfluxDB.export() for backup status."""
-    (exporter, mock_influxdb_client) = setup_test_influxdb_exporter(mock_influxdb)
+    (exporter, mock_influxdb_client) = influxdb_exporter
 
-    key = ResticSnapshotKeys(hostname="hostname", paths=["path1"])
     backup_status = ResticBackupStatus(
-        key=key,
+        key=TEST_SNAPSHOT_KEY,
         files_total=9586,
         bytes_total=147893659,
         percent_done=0.25,
@@ -146,9 +173,6 @@ def test_exporter_influxdb_export_restic_backup_status(
         seconds_remaining=None,
     )
 
-    current_datetime = datetime.datetime(2020, 12, 30, 8, 27, 23)
-    mock_current_datetime.return_value = current_datetime
-
     exporter.export([backup_status])
 
     mock_influxdb_client.write_points.assert_called_with(
@@ -156,7 +180,7 @@ def test_exporter_influxdb_export_restic_backup_status(
             {
                 "measurement": "restic_backup_status",
                 "tags": {"hostname": "hostname", "paths": "path1"},
-                "time": current_datetime,
+                "time": frozen_datetime,
                 "fields": {
                     "total_files": 9586,
                     "total_bytes": 147893659,
@@ -169,13 +193,11 @@ def test_exporter_influxdb_export_restic_backup_status(
     )
 
 
-@mock.patch("restic_exporter.exporters.influxdb.InfluxDBClient")
-@mock.patch("restic_exporter.exporters.get_current_datetime")
 def test_exporter_influxdb_export_restic_backup_summary(
-    mock_current_datetime: mock.Mock, mock_influxdb: mock.Mock
+    influxdb_exporter: Tuple[Exporter, mock.Mock], frozen_datetime: datetime.datetime
 ) -> None:
     """Test ExporterInfluxDB.export() for backup summary."""
-    (exporter, mock_influxdb_client) = setup_test_influxdb_exporter(mock_influxdb)
+    (exporter, mock_influxdb_client) = influxdb_exporter
 
     backup_summary = ResticBackupSummary(
         key=ResticSnapshotKeys(
@@ -198,9 +220,6 @@ def test_exporter_influxdb_export_restic_backup_summary(
         duration=4.035790225,
     )
 
-    current_datetime = datetime.datetime(2020, 12, 30, 8, 27, 23)
-    mock_current_datetime.return_value = current_datetime
-
     exporter.export([backup_summary])
 
     mock_influxdb_client.write_points.assert_called_with(
@@ -212,7 +231,7 @@ def test_exporter_influxdb_export_restic_backup_summary(
                     "paths": "path1,path2",
                     "tags": "tag1,tag2",
                 },
-                "time": current_datetime,
+                "time": frozen_datetime,
                 "fields": {
                     "files_new": 1265,
                     "files_changed": 41,
@@ -233,10 +252,11 @@ def test_exporter_influxdb_export_restic_backup_summary(
     )
 
 
-@mock.patch("restic_exporter.exporters.influxdb.InfluxDBClient")
-def test_exporter_influxdb_export_restic_snapshot(mock_influxdb: mock.Mock) -> None:
+def test_exporter_influxdb_export_restic_snapshot(
+    influxdb_exporter: Tuple[Exporter, mock.Mock],
+) -> None:
     """Test ExporterInfluxDB.export() for snapshots."""
-    (exporter, mock_influxdb_client) = setup_test_influxdb_exporter(mock_influxdb)
+    (exporter, mock_influxdb_client) = influxdb_exporter
 
     snapshot = ResticSnapshot(
         ResticSnapshotKeys(
@@ -246,14 +266,9 @@ def test_exporter_influxdb_export_restic_snapshot(mock_influxdb: mock.Mock) -> N
             snapshot_id="1234",
         ),
         snapshot_time=datetime.datetime(
-            2020, 12, 28, 21, 28, 23, 403981, tzinfo=dateutil.tz.tzoffset(None, -28800)  # type: ignore
-        ),
-        stats=ResticStatsBundle(
-            raw=ResticStats(total_size=1709, total_file_count=1, total_blob_count=None),
-            restore=ResticStats(
-                total_size=1710, total_file_count=2, total_blob_count=None
-            ),
+            2020, 12, 28, 21, 28, 23, 403981, tzinfo=TEST_UTC_MINUS_8
         ),
+        stats=_STATS_BUNDLE_NO_BLOBS,
     )
 
     exporter.export([snapshot])
@@ -276,33 +291,23 @@ def test_exporter_influxdb_export_restic_snapshot(mock_influxdb: mock.Mock) -> N
     )
 
 
-@mock.patch("restic_exporter.exporters.influxdb.InfluxDBClient")
-@mock.patch("restic_exporter.exporters.get_current_datetime")
 def test_exporter_influxdb_export_repo(
-    mock_current_datetime: mock.Mock, mock_influxdb: mock.Mock
+    influxdb_exporter: Tuple[Exporter, mock.Mock], frozen_datetime: datetime.datetime
 ) -> None:
     """Test ExporterInfluxDB.export() for repo stats."""
-    (exporter, mock_influxdb_client) = setup_test_influxdb_exporter(mock_influxdb)
+    (exporter, mock_influxdb_client) = influxdb_exporter
 
     repo = ResticRepoStats(
-        stats=ResticStatsBundle(
-            raw=ResticStats(total_size=1709, total_file_count=1, total_blob_count=None),
-            restore=ResticStats(
-                total_size=1710, total_file_count=2, total_blob_count=None
-            ),
-        ),
+        stats=_STATS_BUNDLE_NO_BLOBS,
     )
 
-    current_datetime = datetime.datetime(2020, 12, 30, 8, 27, 23)
-    mock_current_datetime.return_value = current_datetime
-
     exporter.export([repo])
 
     mock_influxdb_client.write_points.assert_called_with(
         [
             {
                 "measurement": "restic_repo_stats",
-                "time": current_datetime,
+                "time": frozen_datetime,
                 "fields": {
                     "raw_size": 1709,
                     "raw_file_count": 1,
@@ -314,24 +319,24 @@ def test_exporter_influxdb_export_repo(
     )
 
 
-@mock.patch("restic_exporter.exporters.influxdb.InfluxDBClient")
-def test_exporter_influxdb_export_repo_no_fields(mock_influxdb: mock.Mock) -> None:
+def test_exporter_influxdb_export_repo_no_fields(
+    influxdb_exporter: Tuple[Exporter, mock.Mock],
+) -> None:
     """Test ExporterInfluxDB.export() for repo stats."""
-    (exporter, mock_influxdb_client) = setup_test_influxdb_exporter(mock_influxdb)
+    (exporter, mock_influxdb_client) = influxdb_exporter
 
     # Ensure a point with no repo data doesn't get written.
     repo = ResticRepoStats(stats=ResticStatsBundle())
     exporter.export([repo])
 
-    assert mock_influxdb_client.write_points.assert_not_called
+    mock_influxdb_client.write_points.assert_not_called()
 
 
-@mock.patch("restic_exporter.exporters.influxdb.InfluxDBClient")
 def test_exporter_influxdb_export_unknown(
-    mock_influxdb: mock.Mock, caplog: Any
+    influxdb_exporter: Tuple[Exporter, mock.Mock], caplog: Any
 ) -> None:
     """Test ExporterInfluxDB.export() for unknown stats types."""
-    (exporter, mock_influxdb_client) = setup_test_influxdb_exporter(mock_influxdb)
+    (exporter, mock_influxdb_client) = influxdb_exporter
 
     exporter.export("this_is_not_an_expected_type")  # type: ignore
 
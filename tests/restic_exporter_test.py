@@ -1,19 +1,23 @@
 """Test for the restic-exporter."""
 
 import argparse
+import attr
 import datetime
+import io
 import json
 import pytest  # type: ignore
-import logging
 import subprocess
 import sys
-from typing import Any, List
+from types import SimpleNamespace
+from typing import Any, Dict, List, Optional
 from unittest import mock
 
 from restic_exporter.restic_exporter import (
     get_snapshot_key_from_args,
     main,
+    read_piped_lines,
     ResticExecutor,
+    ResticPipedStatsGenerator,
     ResticStatsGenerator,
 )
 from restic_exporter.types import (
@@ -26,8 +30,8 @@ from restic_exporter.types import (
     json_to_stats,
     json_to_backup_summary,
 )
-import restic_exporter
 from restic_exporter import get_current_datetime
+from restic_exporter import restic_exporter as restic_exporter_module
 
 from . import (
     dict_without,
@@ -37,6 +41,8 @@ from . import (
     TEST_SNAPSHOT_DATA,
     TEST_BACKUP_STATUS_DATA,
     TEST_BACKUP_SUMMARY_DATA,
+    TEST_FROZEN_NOW,
+    TEST_SNAPSHOT_KEY,
 )
 
 from restic_exporter.const import (
@@ -45,9 +51,13 @@ from restic_exporter.const import (
 )
 
 
-logging.basicConfig()
-_LOGGER = logging.getLogger(__name__)
-_LOGGER.setLevel(logging.DEBUG)
+_FROZEN_NOW_NEXT = TEST_FROZEN_NOW + datetime.timedelta(minutes=1)
+
+# Serialized once, as restic would output them.
+_STATS_RAW_JSON = json.dumps(TEST_STATS_DATA_RAW)
+_GROUPED_SNAPSHOT_JSON = json.dumps(TEST_GROUPED_SNAPSHOT_DATA)
+_BACKUP_STATUS_JSON = json.dumps(TEST_BACKUP_STATUS_DATA)
+_BACKUP_SUMMARY_JSON = json.dumps(TEST_BACKUP_SUMMARY_DATA)
 
 
 def test_get_current_datetime() -> None:
@@ -64,110 +74,111 @@ def _get_completed_process(args: List[str] = [], rc: int = 0, stdout: str = "",
     )
 
 
-@mock.patch("restic_exporter.restic_exporter.subprocess")
-def test_restic_executor_get_stats(mock_subprocess: mock.Mock, caplog: Any) -> None:
-    """Test the Restic Executor get_stats() method."""
-    path_binary = "/path/to/binary"
-    expected_args = [path_binary, "--json", "stats", "--mode=raw-data"]
-    output = TEST_STATS_DATA_RAW
-
-    r = ResticExecutor(path_binary)
-
-    # Test: Success.
-    mock_subprocess.run = mock.Mock(
-        return_value=_get_completed_process(
-            args=expected_args,
-            rc=0,
-            stdout=json.dumps(output),
-        )
-    )
-    stats = r.get_stats(mode=KEY_MODE_RAW_DATA)
+# The executor never inspects args on the result, so these can be shared.
+_COMPLETED_STATS = _get_completed_process(stdout=_STATS_RAW_JSON)
+_COMPLETED_SNAPSHOTS = _get_completed_process(stdout=_GROUPED_SNAPSHOT_JSON)
+_COMPLETED_FAILED = _get_completed_process(rc=1)
+_COMPLETED_NON_JSON = _get_completed_process(stdout="this will not decode")
 
-    mock_subprocess.run.assert_called_with(expected_args, capture_output=True)
-    assert stats == json_to_stats(output)
-
-    # Test: Non-zero return code.
-    mock_subprocess.run = mock.Mock(
-        return_value=_get_completed_process(
-            args=expected_args,
-            rc=1,
-        )
-    )
-    stats = r.get_stats(mode=KEY_MODE_RAW_DATA)
+# Expected values, parsed once from the shared test data.
+_RAW_STATS = json_to_stats(TEST_STATS_DATA_RAW)
+_RESTORE_STATS = json_to_stats(TEST_STATS_DATA_RESTORE)
+_STATS_BUNDLE = ResticStatsBundle(raw=_RAW_STATS, restore=_RESTORE_STATS)
+_SNAPSHOT = json_to_snapshot(TEST_SNAPSHOT_DATA)
+_BACKUP_STATUS = json_to_backup_status(TEST_BACKUP_STATUS_DATA, TEST_SNAPSHOT_KEY)
+_STATS_BY_MODE = {KEY_MODE_RAW_DATA: _RAW_STATS, KEY_MODE_RESTORE_SIZE: _RESTORE_STATS}
 
-    mock_subprocess.run.assert_called_with(expected_args, capture_output=True)
-    assert stats is None
-    assert "Command failed" in caplog.text
-
-    # Test: Non-JSON returned.
-    mock_subprocess.run = mock.Mock(
-        return_value=_get_completed_process(
-            args=expected_args, rc=0, stdout="this will not decode"
-        )
-    )
-    stats = r.get_stats(mode=KEY_MODE_RAW_DATA)
+
+def _get_stats_by_mode(mode: str, **kwargs: Any) -> Any:
+    """Stand in for ResticExecutor.get_stats()."""
+    return _STATS_BY_MODE[mode]
+
+
+@pytest.fixture  # type: ignore
+def mock_subprocess(monkeypatch: Any) -> mock.Mock:
+    """Replace the subprocess module used to run restic."""
+    mock_subprocess = mock.Mock()
+    monkeypatch.setattr(restic_exporter_module, "subprocess", mock_subprocess)
+    return mock_subprocess
+
+
+_RESTIC_BINARY = "/path/to/binary"
+
+
+@pytest.fixture  # type: ignore
+def executor() -> ResticExecutor:
+    """Provide an executor for a fake restic binary."""
+    return ResticExecutor(_RESTIC_BINARY)
+
+
+@pytest.mark.parametrize(  # type: ignore
+    "completed_process,expected_stats,expected_log",
+    [
+        (_COMPLETED_STATS, _RAW_STATS, None),
+        (_COMPLETED_FAILED, None, "Command failed"),
+        (_COMPLETED_NON_JSON, None, "yielded non-JSON output"),
+    ],
+)
+def test_restic_executor_get_stats(
+    executor: ResticExecutor,
+    mock_subprocess: mock.Mock,
+    completed_process: subprocess.CompletedProcess,  # type: ignore
+    expected_stats: Any,
+    expected_log: Optional[str],
+    caplog: Any,
+) -> None:
+    """Test the Restic Executor get_stats() method."""
+    expected_args = [_RESTIC_BINARY, "--json", "stats", "--mode=raw-data"]
+
+    mock_subprocess.run = mock.Mock(return_value=completed_process)
+    stats = executor.get_stats(mode=KEY_MODE_RAW_DATA)
 
     mock_subprocess.run.assert_called_with(expected_args, capture_output=True)
-    assert stats is None
-    assert "yielded non-JSON output" in caplog.text
+    assert stats == expected_stats
+    if expected_log:
+        assert expected_log in caplog.text
 
 
-@mock.patch("restic_exporter.restic_exporter.subprocess")
-def test_restic_executor_get_snapshots(mock_subprocess: mock.Mock, caplog: Any) -> None:
+@pytest.mark.parametrize(  # type: ignore
+    "completed_process,expected_snapshots,expected_log",
+    [
+        (_COMPLETED_SNAPSHOTS, [_SNAPSHOT], None),
+        (_COMPLETED_FAILED, [], "No valid snapshots found"),
+    ],
+)
+def test_restic_executor_get_snapshots(
+    executor: ResticExecutor,
+    mock_subprocess: mock.Mock,
+    completed_process: subprocess.CompletedProcess,  # type: ignore
+    expected_snapshots: Any,
+    expected_log: Optional[str],
+    caplog: Any,
+) -> None:
     """Test the Restic Executor get_snapshots() method."""
-
-    path_binary = "/path/to/binary"
     expected_args = [
-        path_binary,
+        _RESTIC_BINARY,
         "--json",
         "snapshots",
         "--group-by=host,path,tags",
         "--last",
     ]
 
-    r = ResticExecutor(path_binary)
-
-    # Test: Success.
-    mock_subprocess.run = mock.Mock(
-        return_value=_get_completed_process(
-            args=expected_args,
-            rc=0,
-            stdout=json.dumps(TEST_GROUPED_SNAPSHOT_DATA),
-        )
-    )
-    stats = r.get_snapshots(group_by="host,path,tags", last=True)
+    mock_subprocess.run = mock.Mock(return_value=completed_process)
+    snapshots = executor.get_snapshots(group_by="host,path,tags", last=True)
 
     mock_subprocess.run.assert_called_with(expected_args, capture_output=True)
-    assert stats == [json_to_snapshot(TEST_SNAPSHOT_DATA)]
-
-    # Test: No snapshots.
-    mock_subprocess.run = mock.Mock(
-        args=expected_args,
-        rc=1,
-    )
-    stats = r.get_snapshots(group_by="host,path,tags", last=True)
-
-    mock_subprocess.run.assert_called_with(expected_args, capture_output=True)
-    assert stats == []
-    assert "No valid snapshots found" in caplog.text
+    assert snapshots == expected_snapshots
+    if expected_log:
+        assert expected_log in caplog.text
 
 
 def test_restic_stats_generator_get_snapshot_stats() -> None:
     """Test the Restic stats generator get_snapshot_stats() method."""
     mock_executor = mock.Mock()
-    generator = ResticStatsGenerator(
-        mock_executor, group_by="group_by", last=True, backup_status_window_seconds=10
-    )
+    generator = ResticStatsGenerator(mock_executor, group_by="group_by", last=True)
 
-    mock_executor.get_snapshots = mock.Mock(
-        return_value=[json_to_snapshot(TEST_SNAPSHOT_DATA)]
-    )
-    mock_executor.get_stats = mock.Mock(
-        side_effect=[
-            json_to_stats(TEST_STATS_DATA_RAW),
-            json_to_stats(TEST_STATS_DATA_RESTORE),
-        ]
-    )
+    mock_executor.get_snapshots = mock.Mock(return_value=[_SNAPSHOT])
+    mock_executor.get_stats = mock.Mock(side_effect=_get_stats_by_mode)
 
     stats = generator.get_snapshot_stats()
 
@@ -179,70 +190,53 @@ def test_restic_stats_generator_get_snapshot_stats() -> None:
         ]
     )
 
-    expected_stats = json_to_snapshot(TEST_SNAPSHOT_DATA)
-    assert expected_stats
-    expected_stats.stats = ResticStatsBundle(
-        raw=json_to_stats(TEST_STATS_DATA_RAW),
-        restore=json_to_stats(TEST_STATS_DATA_RESTORE),
-    )
-
-    assert stats == [expected_stats]
-
-
-@mock.patch("restic_exporter.restic_exporter.get_current_datetime")
-def test_restic_stats_generator_get_piped_stats_backup_status(
-    mock_current_datetime: mock.Mock,
-) -> None:
-    """Test the Restic stats generator get_piped_stats() method with backup status."""
-
-    generator = ResticStatsGenerator(
-        mock.Mock(), group_by="group_by", last=True, backup_status_window_seconds=10
-    )
-
-    key = ResticSnapshotKeys(hostname="hostname", paths=["path1"])
-
-    mock_current_datetime.return_value = datetime.datetime(2020, 12, 30, 8, 27, 23)
-
-    # Test: Normal.
-    stats = generator.get_piped_stats(line=json.dumps(TEST_BACKUP_STATUS_DATA), key=key)
-    assert stats == [json_to_backup_status(TEST_BACKUP_STATUS_DATA, key)]
-
-    # Test: Invalid data.
-    stats = generator.get_piped_stats(line="this is garbage", key=key)
-    assert stats == []
-
-    # Test: Missing message type.
-    stats = generator.get_piped_stats(
-        line=json.dumps(dict_without(TEST_BACKUP_STATUS_DATA, "message_type")), key=key
-    )
-    assert stats == []
-
-    # Test: Unsupported message type.
-    stats = generator.get_piped_stats(
-        line=json.dumps({**TEST_BACKUP_STATUS_DATA, "message_type": "unsupported"}),
-        key=key,
-    )
-    assert stats == []
+    assert _SNAPSHOT
+    assert stats == [attr.evolve(_SNAPSHOT, stats=_STATS_BUNDLE)]
 
-    # Test: Another stat in the same window should be ignored.
-    stats = generator.get_piped_stats(line=json.dumps(TEST_BACKUP_STATUS_DATA), key=key)
-    assert stats == []
 
-    mock_current_datetime.return_value = datetime.datetime(2020, 12, 30, 8, 28, 23)
+@pytest.fixture  # type: ignore
+def piped_generator() -> ResticPipedStatsGenerator:
+    """Provide a fresh piped stats generator (it tracks the status window)."""
+    return ResticPipedStatsGenerator(backup_status_window_seconds=10)
 
-    # Test: .. but another later should be fine.
-    stats = generator.get_piped_stats(line=json.dumps(TEST_BACKUP_STATUS_DATA), key=key)
-    assert stats == [json_to_backup_status(TEST_BACKUP_STATUS_DATA, key)]
 
+@mock.patch.object(restic_exporter_module, "get_current_datetime")
+def test_restic_piped_stats_generator_get_piped_stats_backup_status(
+    mock_current_datetime: mock.Mock, piped_generator: ResticPipedStatsGenerator
+) -> None:
+    """Test the Restic piped stats generator get_piped_stats() with backup status."""
+
+    # Cases run in order against the same generator, as the window is stateful.
+    cases = [
+        ("Normal", TEST_FROZEN_NOW, _BACKUP_STATUS_JSON, [_BACKUP_STATUS]),
+        ("Invalid data", TEST_FROZEN_NOW, "this is garbage", []),
+        (
+            "Missing message type",
+            TEST_FROZEN_NOW,
+            json.dumps(dict_without(TEST_BACKUP_STATUS_DATA, "message_type")),
+            [],
+        ),
+        (
+            "Unsupported message type",
+            TEST_FROZEN_NOW,
+            json.dumps({**TEST_BACKUP_STATUS_DATA, "message_type": "unsupported"}),
+            [],
+        ),
+        ("Another stat in the same window", TEST_FROZEN_NOW, _BACKUP_STATUS_JSON, []),
+        ("Another stat later", _FROZEN_NOW_NEXT, _BACKUP_STATUS_JSON, [_BACKUP_STATUS]),
+    ]
+    for description, now, line, expected_stats in cases:
+        mock_current_datetime.return_value = now
+        stats = piped_generator.get_piped_stats(line=line, key=TEST_SNAPSHOT_KEY)
+        assert stats == expected_stats, description
 
-def test_restic_stats_generator_get_piped_stats_backup_summary() -> None:
-    """Test the Restic stats generator get_piped_stats() method with backup summary."""
 
-    generator = ResticStatsGenerator(
-        mock.Mock(), group_by="group_by", last=True, backup_status_window_seconds=10
-    )
+def test_restic_piped_stats_generator_get_piped_stats_backup_summary(
+    piped_generator: ResticPipedStatsGenerator,
+) -> None:
+    """Test the Restic piped stats generator get_piped_stats() with backup summary."""
 
-    key = ResticSnapshotKeys(hostname="hostname", paths=["path1"])
+    key = TEST_SNAPSHOT_KEY
     backup_summary = json_to_backup_summary(TEST_BACKUP_SUMMARY_DATA, key)
     assert backup_summary
 
@@ -257,13 +251,11 @@ def test_restic_stats_generator_get_piped_stats_backup_summary() -> None:
     )
 
     # Test: Normal.
-    stats = generator.get_piped_stats(
-        line=json.dumps(TEST_BACKUP_SUMMARY_DATA), key=key
-    )
+    stats = piped_generator.get_piped_stats(line=_BACKUP_SUMMARY_JSON, key=key)
     assert stats == [last_backup_status, backup_summary]
 
     # Test: Broken summary.
-    stats = generator.get_piped_stats(
+    stats = piped_generator.get_piped_stats(
         line=json.dumps(dict_without(TEST_BACKUP_SUMMARY_DATA, "files_new")), key=key
     )
     assert stats == []
@@ -272,26 +264,12 @@ def test_restic_stats_generator_get_piped_stats_backup_summary() -> None:
 def test_restic_stats_generator_get_repo_stats() -> None:
     """Test the Restic stats generator get_repo_stats() method."""
     mock_executor = mock.Mock()
-    generator = ResticStatsGenerator(
-        mock_executor, group_by="group_by", last=True, backup_status_window_seconds=10
-    )
+    generator = ResticStatsGenerator(mock_executor, group_by="group_by", last=True)
 
-    mock_executor.get_stats = mock.Mock(
-        side_effect=[
-            json_to_stats(TEST_STATS_DATA_RAW),
-            json_to_stats(TEST_STATS_DATA_RESTORE),
-        ]
-    )
+    mock_executor.get_stats = mock.Mock(side_effect=_get_stats_by_mode)
 
     stats = generator.get_repo_stats()
-    assert stats == [
-        ResticRepoStats(
-            stats=ResticStatsBundle(
-                raw=json_to_stats(TEST_STATS_DATA_RAW),
-                restore=json_to_stats(TEST_STATS_DATA_RESTORE),
-            )
-        )
-    ]
+    assert stats == [ResticRepoStats(stats=_STATS_BUNDLE)]
 
     mock_executor.get_stats.assert_has_calls(
         [
@@ -301,58 +279,114 @@ def test_restic_stats_generator_get_repo_stats() -> None:
     )
 
 
-def test_get_snapshot_key_from_args(caplog: Any) -> None:
-    """Test generating a snapshot key from command line arguments."""
+def _get_chunked_stream(*chunks: bytes) -> Any:
+    """Get a stream whose read1() returns the given chunks in order."""
+    reads = iter(chunks)
+    return SimpleNamespace(read1=lambda size: next(reads))
 
+
+def test_read_piped_lines() -> None:
+    """Test reading batches of lines from piped input."""
+
+    # Test: Lines split across reads are reassembled, a trailing partial line
+    # is returned at EOF.
+    stream = _get_chunked_stream(b"line1\nli", b"ne2\nline3\nline4", b"", b"unused")
+    assert list(read_piped_lines(stream)) == [
+        ["line1"],
+        ["line2", "line3"],
+        ["line4"],
+    ]
+
+    # Test: No input.
+    assert list(read_piped_lines(_get_chunked_stream(b""))) == []
+
+
+@pytest.fixture(scope="module")  # type: ignore
+def snapshot_key_parser() -> argparse.ArgumentParser:
+    """Provide a parser with the snapshot key arguments registered."""
     ap = argparse.ArgumentParser()
     ap.add_argument("--backup-host")
     ap.add_argument("--backup-path")
     ap.add_argument("--backup-tag")
+    return ap
 
-    # Test: Normal.
-    args = ap.parse_args(
-        ["--backup-host", "host", "--backup-path=/path", "--backup-tag", "tag1"]
+
+@pytest.mark.parametrize(  # type: ignore
+    "argv,expected_tags",
+    [
+        (["--backup-tag", "tag1"], ["tag1"]),
+        (["--backup-tag", "tag1,tag2 tag3,tag4"], ["tag1", "tag2", "tag3", "tag4"]),
+    ],
+)
+def test_get_snapshot_key_from_args(
+    snapshot_key_parser: argparse.ArgumentParser,
+    argv: List[str],
+    expected_tags: List[str],
+) -> None:
+    """Test generating a snapshot key from command line arguments."""
+    args = snapshot_key_parser.parse_args(
+        ["--backup-host", "host", "--backup-path=/path", *argv]
     )
-    assert get_snapshot_key_from_args(ap, args) == ResticSnapshotKeys(
+    assert get_snapshot_key_from_args(snapshot_key_parser, args) == ResticSnapshotKeys(
         hostname="host",
         paths=["/path"],
-        tags=["tag1"],
+        tags=expected_tags,
     )
 
-    # Test: Missing --backup-host
-    args = ap.parse_args(["--backup-path=/path", "--backup-tag", "tag1"])
-    with pytest.raises(SystemExit):
-        get_snapshot_key_from_args(ap, args)
-        assert "Backup host must be provided" in caplog.text
 
-    # Test: Missing --backup-path
-    args = ap.parse_args(["--backup-host=host", "--backup-tag", "tag1"])
+@pytest.mark.parametrize(  # type: ignore
+    "argv,expected_log",
+    [
+        (
+            ["--backup-path=/path", "--backup-tag", "tag1"],
+            "Backup host must be provided",
+        ),
+        (
+            ["--backup-host=host", "--backup-tag", "tag1"],
+            "Backup path must be provided",
+        ),
+    ],
+)
+def test_get_snapshot_key_from_args_missing(
+    snapshot_key_parser: argparse.ArgumentParser,
+    argv: List[str],
+    expected_log: str,
+    caplog: Any,
+) -> None:
+    """Test generating a snapshot key with required arguments missing."""
+    args = snapshot_key_parser.parse_args(argv)
     with pytest.raises(SystemExit):
-        get_snapshot_key_from_args(ap, args)
-        assert "Backup path must be provided" in caplog.text
-
-    # Test: Multiple tags
-    args = ap.parse_args(
-        [
-            "--backup-host",
-            "host",
-            "--backup-path=/path",
-            "--backup-tag",
-            "tag1,tag2 tag3,tag4",
-        ]
-    )
-    assert get_snapshot_key_from_args(ap, args) == ResticSnapshotKeys(
-        hostname="host",
-        paths=["/path"],
-        tags=["tag1", "tag2", "tag3", "tag4"],
+        get_snapshot_key_from_args(snapshot_key_parser, args)
+    assert expected_log in caplog.text
+
+
+def _run_main(
+    monkeypatch: Any,
+    args: List[str],
+    mock_exporter: mock.Mock,
+    stdin: Any,
+    **patches: Any,
+) -> Dict[str, mock.Mock]:
+    """Run main() with a mock exporter, returning the patched module attributes.
+
+    Each keyword argument patches the named restic_exporter attribute with a
+    mock returning the given value.
+    """
+    monkeypatch.setattr(
+        restic_exporter_module, "EXPORTERS", {"mock_exporter": mock_exporter}
     )
+    monkeypatch.setattr(sys, "argv", [sys.argv[0], "mock_exporter", *args])
+    monkeypatch.setattr(sys, "stdin", stdin)
+    mocks = {name: mock.Mock(return_value=value) for name, value in patches.items()}
+    for name, mock_attr in mocks.items():
+        monkeypatch.setattr(restic_exporter_module, name, mock_attr)
+    main()
+    return mocks
 
 
-def test_main_tty(caplog: Any) -> None:
+def test_main_tty(monkeypatch: Any) -> None:
     """Test the main() function with input from a tty."""
 
-    test_args = [sys.argv[0], "mock_exporter"]
-
     mock_exporter = mock.Mock()
     mock_exporter.construct_from_args = mock.Mock(return_value=mock_exporter)
 
@@ -363,57 +397,70 @@ def test_main_tty(caplog: Any) -> None:
     mock_generator.get_snapshot_stats = mock.Mock(return_value=["stats_here"])
     mock_generator.get_repo_stats = mock.Mock(return_value=["repo_stats_here"])
 
-    with mock.patch.dict(
-        restic_exporter.exporters.EXPORTERS,
-        {"mock_exporter": mock_exporter},
-        clear=True,
-    ), mock.patch.object(sys, "argv", test_args), mock.patch(
-        "restic_exporter.restic_exporter.ResticStatsGenerator",
-        return_value=mock_generator,
-    ), mock.patch.object(
-        sys, "stdin", mock_stdin
-    ):
-        main()
+    _run_main(
+        monkeypatch, [], mock_exporter, mock_stdin, ResticStatsGenerator=mock_generator
+    )
 
     assert mock_exporter.add_args_to_parser.called
     assert mock_exporter.start.called
     mock_exporter.export.assert_called_with(["stats_here", "repo_stats_here"])
 
 
-def test_main_not_tty(caplog: Any) -> None:
+def test_main_not_tty(monkeypatch: Any) -> None:
     """Test the main() function with input not from a tty."""
 
-    test_args = [
-        sys.argv[0],
-        "mock_exporter",
-        "--backup-host=host",
-        "--backup-path=path",
-    ]
-
     mock_exporter = mock.Mock()
     mock_exporter.construct_from_args = mock.Mock(return_value=mock_exporter)
 
-    stdin_lines = ["line1", "line2", ""]
-    mock_stdin = mock.Mock()
-    mock_stdin.isatty = mock.Mock(return_value=False)
-    mock_stdin.readline = mock.Mock(side_effect=stdin_lines)
+    # An in-memory stream is not a tty, just like piped input.
+    stdin = io.TextIOWrapper(io.BytesIO(b"line1\nline2\n"))
 
     test_stats = [["stat1"], ["stat2", "stat3"]]
     mock_generator = mock.Mock()
     mock_generator.get_piped_stats = mock.Mock(side_effect=test_stats)
 
-    with mock.patch.dict(
-        restic_exporter.exporters.EXPORTERS,
-        {"mock_exporter": mock_exporter},
-        clear=True,
-    ), mock.patch.object(sys, "argv", test_args), mock.patch(
-        "restic_exporter.restic_exporter.ResticStatsGenerator",
-        return_value=mock_generator,
-    ), mock.patch.object(
-        sys, "stdin", mock_stdin
-    ):
-        main()
+    mocks = _run_main(
+        monkeypatch,
+        ["--backup-host=host", "--backup-path=path"],
+        mock_exporter,
+        stdin,
+        ResticPipedStatsGenerator=mock_generator,
+        ResticExecutor=None,
+    )
 
     assert mock_exporter.add_args_to_parser.called
     assert mock_exporter.start.called
-    mock_exporter.export.assert_called_with(["stat1", "stat2", "stat3"])
+
+    # Restic itself should not be queried for piped input.
+    assert not mocks["ResticExecutor"].called
+
+    # Stats from lines read together should be exported once, as a single batch.
+    mock_generator.get_piped_stats.assert_has_calls(
+        [mock.call("line1", mock.ANY), mock.call("line2", mock.ANY)]
+    )
+    mock_exporter.export.assert_called_once_with(["stat1", "stat2", "stat3"])
+
+
+def test_main_no_exporters(monkeypatch: Any) -> None:
+    """Test the main() function when no exporters could be constructed."""
+
+    mock_exporter = mock.Mock()
+    mock_exporter.construct_from_args = mock.Mock(return_value=None)
+
+    mock_stdin = mock.Mock()
+    mock_stdin.isatty = mock.Mock(return_value=False)
+    mock_stdin.buffer.read1 = mock.Mock(side_effect=[b"line1\n", b"line2\n", b""])
+
+    mock_generator = mock.Mock()
+
+    _run_main(
+        monkeypatch,
+        ["--backup-host=host", "--backup-path=path"],
+        mock_exporter,
+        mock_stdin,
+        ResticPipedStatsGenerator=mock_generator,
+    )
+
+    # Stdin should still be fully drained, but no stats generated.
+    assert mock_stdin.buffer.read1.call_count == 3
+    assert not mock_generator.get_piped_stats.called
@@ -1,8 +1,7 @@
 """Test for the Restic Exporter types."""
 import datetime
-import dateutil
+import json
 import pytest  # type: ignore
-import logging
 from typing import Any
 
 from restic_exporter.types import (
@@ -15,6 +14,8 @@ from restic_exporter.types import (
     json_to_snapshot,
     json_to_backup_status,
     json_to_backup_summary,
+    json_to_snapshots,
+    parse_time,
 )
 
 from . import (
@@ -22,12 +23,9 @@ from . import (
     TEST_SNAPSHOT_DATA,
     TEST_BACKUP_STATUS_DATA,
     TEST_BACKUP_SUMMARY_DATA,
+    TEST_UTC_MINUS_8,
 )
 
-logging.basicConfig()
-_LOGGER = logging.getLogger(__name__)
-_LOGGER.setLevel(logging.DEBUG)
-
 
 def test_json_to_stats(caplog: Any) -> None:
     """Test json_to_stats()."""
@@ -36,6 +34,13 @@ def test_json_to_stats(caplog: Any) -> None:
         {"total_size": 1709, "total_file_count": 1, "total_blob_count": 4}
     ) == ResticStats(total_size=1709, total_file_count=1, total_blob_count=4)
 
+    # Test: Equal stats share a single object.
+    assert json_to_stats(
+        {"total_size": 1709, "total_file_count": 1, "total_blob_count": 4}
+    ) is json_to_stats(
+        {"total_size": 1709, "total_file_count": 1, "total_blob_count": 4}
+    )
+
     # Test: Converting from floats.
     assert json_to_stats(
         {"total_size": 1709.0, "total_file_count": 1.0, "total_blob_count": 4.0}
@@ -83,11 +88,23 @@ def test_json_to_snapshot(caplog: Any) -> None:
             snapshot_id="ab12",
         ),
         snapshot_time=datetime.datetime(
-            2020, 12, 28, 21, 28, 23, 403981, tzinfo=dateutil.tz.tzoffset(None, -28800)  # type: ignore
+            2020, 12, 28, 21, 28, 23, 403981, tzinfo=TEST_UTC_MINUS_8
         ),
         stats=None,
     )
 
+    # Test: Repeated strings are shared between snapshots.
+    snapshots = [
+        json_to_snapshot(json.loads(json.dumps({**TEST_SNAPSHOT_DATA, "tags": ["t"]})))
+        for _ in range(2)
+    ]
+    assert snapshots[0] and snapshots[1]
+    assert snapshots[0].key.hostname is snapshots[1].key.hostname
+    assert snapshots[0].key.paths[0] is snapshots[1].key.paths[0]
+    assert snapshots[0].key.tags and snapshots[1].key.tags
+    assert snapshots[0].key.tags[0] is snapshots[1].key.tags[0]
+    assert isinstance(snapshots[0].key.paths, tuple)
+
     # Test: Missing keys result in a warning.
     assert json_to_snapshot(dict_without(TEST_SNAPSHOT_DATA, "time")) is None
     assert "Skipping snapshot with missing key" in caplog.text
@@ -100,6 +117,58 @@ def test_json_to_snapshot(caplog: Any) -> None:
     assert json_to_snapshot(None) is None  # type: ignore
 
 
+def test_parse_time() -> None:
+    """Test parse_time()."""
+    # Test: Nanosecond precision is truncated to microseconds.
+    assert parse_time("2020-12-28T21:28:23.403981118-08:00") == datetime.datetime(
+        2020, 12, 28, 21, 28, 23, 403981, tzinfo=TEST_UTC_MINUS_8
+    )
+
+    # Test: Timestamps with the same offset share a timezone object.
+    assert (
+        parse_time("2020-12-28T21:28:23-08:00").tzinfo
+        is parse_time("2021-01-01T00:00:00.1-08:00").tzinfo
+    )
+
+    # Test: UTC designator and short fractions.
+    assert parse_time("2020-12-28T21:28:23.4Z") == datetime.datetime(
+        2020, 12, 28, 21, 28, 23, 400000, tzinfo=datetime.timezone.utc
+    )
+
+    # Test: No fraction.
+    assert parse_time("2020-12-28T21:28:23+01:00") == datetime.datetime(
+        2020, 12, 28, 20, 28, 23, tzinfo=datetime.timezone.utc
+    )
+
+    # Test: Timestamps without a timezone are naive.
+    assert parse_time("2020-12-28T21:28:23") == datetime.datetime(
+        2020, 12, 28, 21, 28, 23
+    )
+
+    # Test: Non RFC 3339 input is rejected.
+    with pytest.raises(ValueError):
+        parse_time("28 Dec 2020 21:28:23")
+    with pytest.raises(ValueError):
+        parse_time("2020-13-28T21:28:23Z")
+    with pytest.raises(ValueError):
+        parse_time("garbage")
+
+
+def test_json_to_snapshots() -> None:
+    """Test json_to_snapshots()."""
+    # Test: Invalid snapshots are skipped.
+    assert json_to_snapshots(
+        [
+            TEST_SNAPSHOT_DATA,
+            dict_without(TEST_SNAPSHOT_DATA, "time"),
+            TEST_SNAPSHOT_DATA,
+        ]
+    ) == [json_to_snapshot(TEST_SNAPSHOT_DATA), json_to_snapshot(TEST_SNAPSHOT_DATA)]
+
+    # Test: Empty.
+    assert json_to_snapshots([]) == []
+
+
 def test_json_to_backup_status(caplog: Any) -> None:
     """Test json_to_backup_status()."""
     key = ResticSnapshotKeys(hostname="hostname", paths=["path1"])
@@ -167,6 +236,9 @@ def test_json_to_backup_summary(caplog: Any) -> None:
         duration=4.035790225,
     )
 
+    # Test: The caller's key is not modified.
+    assert key.snapshot_id is None
+
     # Test: Missing keys result in a warning.
     assert (
         json_to_backup_summary(dict_without(TEST_BACKUP_SUMMARY_DATA, "files_new"), key)
@@ -195,3 +267,9 @@ def test_restic_snapshot_keys_validation() -> None:
     # Test: Empty hostname should not be allowed.
     with pytest.raises(ValueError):
         assert ResticSnapshotKeys(hostname="", paths=["path1"]) is None
+
+    # Test: A bare string is not a list of paths or tags.
+    with pytest.raises(TypeError):
+        ResticSnapshotKeys(hostname="hostname", paths="/srv")
+    with pytest.raises(TypeError):
+        ResticSnapshotKeys(hostname="hostname", paths=["path1"], tags="daily")